@@ -1,12 +1,32 @@
+import csv
+import io
 import os
+import shutil
+import time
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.figure_factory as ff
 import folium
 from streamlit_folium import st_folium
+from PIL import Image, ImageOps
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Google Sheetsを再読み込みする間隔（秒）
+GSHEET_REFRESH_SEC = 30
+
+HEADERS = [
+    "Location", "Hard_Y_Authenticity", "Hard_X_Affect",
+    "Soft_Y_Correctness", "Soft_X_Affect",
+    "Comment", "Image_Path", "Timestamp"
+]
+NUMERIC_COLS = ["Hard_Y_Authenticity", "Hard_X_Affect", "Soft_Y_Correctness", "Soft_X_Affect"]
+# シート上の行を特定するための列（行番号は他の端末の記録・削除でずれるため使わない）
+ROW_KEY_COLS = ["Location", "Comment", "Timestamp"]
+
 # --- Google Sheets 連携 ---
 GSHEET_ENABLED = False
 gsheet_worksheet = None
@@ -32,58 +52,158 @@ except Exception as e:
     _gsheet_error = str(e)
 
 
+def logs_frame(logs):
+    """ログ（レコードのリストまたはDataFrame）を列と型を揃えたDataFrameに変換する"""
+    df = pd.DataFrame(logs).reindex(columns=HEADERS)
+    # 数値型に一括変換（Google Sheetsから文字列・空欄で来る場合の対策）
+    df[NUMERIC_COLS] = (
+        df[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce').fillna(0).astype("float32")
+    )
+    return df.fillna("")
+
+
+@st.cache_data(ttl=GSHEET_REFRESH_SEC, show_spinner=False)
+def _load_logs_cached():
+    """Google Sheetsの全セルを2次元リストで取得する（30秒キャッシュ、書き込み時に破棄）"""
+    return gsheet_worksheet.get_all_values()
+
+
+@st.cache_data(show_spinner=False)
+def _load_csv_cached(path, mtime):
+    """CSVを読み込む（ファイル更新時刻をキーにキャッシュ）"""
+    return logs_frame(pd.read_csv(path))
+
+
+def _invalidate_logs():
+    """書き込み後に、次の再実行でシートを読み直させる"""
+    _load_logs_cached.clear()
+    st.session_state._last_fetch = 0.0
+
+
 def load_from_gsheet():
     """Google Sheetsから全データを読み込む"""
     try:
-        records = gsheet_worksheet.get_all_records()
-        if records:
-            df = pd.DataFrame(records)
-            df = df.fillna("")
-            return df.to_dict("records")
-        return []
+        rows = _load_logs_cached()
+        if len(rows) < 2:
+            return logs_frame([])
+        # 1行目をヘッダーとして pandas 側でまとめて変換する
+        return logs_frame(pd.DataFrame(rows[1:], columns=rows[0]))
     except Exception:
-        return []
+        return logs_frame([])
 
 
-def save_to_gsheet(log_entry):
-    """Google Sheetsに1行追加する"""
+def ensure_gsheet_headers():
+    """ヘッダー行が無ければ追加する（セッションにつき1回だけ確認）"""
+    if st.session_state.get("_headers_ok"):
+        return
     try:
-        # ヘッダーが無ければ追加
-        existing = gsheet_worksheet.get_all_values()
-        headers = [
-            "Location", "Hard_Y_Authenticity", "Hard_X_Affect",
-            "Soft_Y_Correctness", "Soft_X_Affect",
-            "Comment", "Image_Path", "Timestamp"
-        ]
+        existing = gsheet_worksheet.row_values(1)
         if not existing:
-            gsheet_worksheet.append_row(headers)
-
-        row = [
-            log_entry.get("Location", ""),
-            log_entry.get("Hard_Y_Authenticity", 0),
-            log_entry.get("Hard_X_Affect", 0),
-            log_entry.get("Soft_Y_Correctness", 0),
-            log_entry.get("Soft_X_Affect", 0),
-            log_entry.get("Comment", ""),
-            log_entry.get("Image_Path", ""),
-            log_entry.get("Timestamp", ""),
-        ]
-        gsheet_worksheet.append_row(row)
+            gsheet_worksheet.append_row(HEADERS)
+        st.session_state["_headers_ok"] = True
+    except Exception:
+        pass
+
+
+def flush_pending_logs():
+    """未送信の行をまとめて1回の append_rows で送信する"""
+    pending = st.session_state.setdefault("_pending", [])
+    if not pending:
+        return True
+    # ヘッダー行を確認できるまでは送信しない（空のシートの1行目にデータが入るのを防ぐ）
+    ensure_gsheet_headers()
+    if not st.session_state.get("_headers_ok"):
+        return False
+    try:
+        # RAWで書き込む（USER_ENTEREDだと "=" で始まるコメントが数式に、
+        # Timestampが日付シリアル値に変換されてしまう）
+        gsheet_worksheet.append_rows(pending, value_input_option="RAW")
+        pending.clear()
+        _invalidate_logs()
         return True
     except Exception:
+        # 送信に失敗した行は次回の再実行時にまとめて再送する
         return False
 
 
-def delete_from_gsheet(row_index):
-    """Google Sheetsから行を削除する (row_index: 0-based, ヘッダー除く)"""
+def save_to_gsheet(log_entry):
+    """Google Sheetsに1行追加する"""
+    row = [
+        log_entry.get("Location", ""),
+        log_entry.get("Hard_Y_Authenticity", 0),
+        log_entry.get("Hard_X_Affect", 0),
+        log_entry.get("Soft_Y_Correctness", 0),
+        log_entry.get("Soft_X_Affect", 0),
+        log_entry.get("Comment", ""),
+        log_entry.get("Image_Path", ""),
+        log_entry.get("Timestamp", ""),
+    ]
+    st.session_state.setdefault("_pending", []).append(row)
+    return flush_pending_logs()
+
+
+def delete_from_gsheet(key):
+    """Google Sheetsから ROW_KEY_COLS の値が key と一致する行を削除する"""
+    target = [str(key[c]) for c in ROW_KEY_COLS]
+    # 未送信の行ならシートではなく送信待ちから取り除く
+    pending = st.session_state.get("_pending", [])
+    key_idx = [HEADERS.index(c) for c in ROW_KEY_COLS]
+    for n in range(len(pending) - 1, -1, -1):
+        if [str(pending[n][c]) for c in key_idx] == target:
+            del pending[n]
+            return True
     try:
-        # gspreadは1-based, ヘッダーが1行目なので +2
-        gsheet_worksheet.delete_rows(row_index + 2)
-        return True
+        # 手元のログは最大 GSHEET_REFRESH_SEC 古く、他の端末の記録で行番号が
+        # ずれている可能性があるため、削除直前のシートから対象行を探す
+        # (シート全体ではなく ROW_KEY_COLS の列だけを1回の batch_get で取得する)
+        letters = [chr(ord("A") + i) for i in key_idx]
+        cols = [
+            value_range[0] if value_range else []
+            for value_range in gsheet_worksheet.batch_get(
+                [f"{letter}:{letter}" for letter in letters], major_dimension="COLUMNS"
+            )
+        ]
+        # 各列の先頭がヘッダーと一致しなければ列の並びが想定と違うので消さない
+        if [col[0] if col else "" for col in cols] != ROW_KEY_COLS:
+            return False
+        # 末尾の空セルは返ってこないため、列の長さを揃える
+        n_rows = max(len(col) for col in cols)
+        cols = [col + [""] * (n_rows - len(col)) for col in cols]
+        for n in range(n_rows - 1, 0, -1):
+            if [col[n] for col in cols] == target:
+                # gspreadは1-based
+                gsheet_worksheet.delete_rows(n + 1)
+                _invalidate_logs()
+                return True
+        return False
     except Exception:
         return False
 
 
+@st.cache_resource
+def _io_executor():
+    """写真の削除などをバックグラウンドで行うスレッドプール"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def remove_photo(img_path):
+    """写真ファイルを削除する（存在しなければ何もしない）"""
+    try:
+        os.remove(img_path)
+    except OSError:
+        pass
+
+
+def append_to_csv(log_entry, path="okinawa_survey_data.csv"):
+    """CSVに1行追記する（ファイルが無い・空の場合はヘッダーも書く）"""
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS, extrasaction="ignore")
+        if write_header:
+            writer.writeheader()
+        writer.writerow(log_entry)
+
+
 # ページ設定
 st.set_page_config(page_title="Okinawa Spectrum Logger", layout="wide")
 
@@ -107,29 +227,181 @@ LAT_LON = {
     "佐喜眞美術館 (宜野湾)": [26.273, 127.754],
     "那覇港・フェリー (海上)": [26.216, 127.674]
 }
+# 地図描画用に 地点名→インデックス と 緯度・経度の配列 に分けて持つ
+LOC_NAMES = tuple(LAT_LON.keys())
+LOC_IDX = {name: i for i, name in enumerate(LOC_NAMES)}
+LATS = np.array([v[0] for v in LAT_LON.values()], dtype=np.float32)
+LONS = np.array([v[1] for v in LAT_LON.values()], dtype=np.float32)
 
-# セッション状態の初期化
-if 'logs' not in st.session_state:
+# ヘッダー行の確認は起動時に1回だけ行う
+if GSHEET_ENABLED:
+    ensure_gsheet_headers()
+
+# 送信に失敗した記録があれば再送し、残っている間は警告を出す
+if GSHEET_ENABLED and not flush_pending_logs():
+    st.warning(
+        f"⚠️ {len(st.session_state._pending)}件の記録がGoogle Sheetsに未送信です"
+        "（画面を操作すると再送します）"
+    )
+
+# --- 可視化の構築（ログ内容が同じなら再実行時はキャッシュから返す） ---
+# 統合ベクトル図で矢印を注釈（SVG）として描く最大件数
+MAX_ARROW_ANNOTATIONS = 200
+# 記録リストの1ページあたりの件数
+RECORDS_PER_PAGE = 10
+# 図・地図のキャッシュを保持するログの組数（表示するのは常に最新の組だけ）
+FIGURE_CACHE_ENTRIES = 8
+
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def build_figures(df):
+    """ハード図・ソフト図・統合ベクトル図を作成する"""
+
+    # 🟥 ハード図
+    fig_h = px.scatter(
+        df, x="Hard_X_Affect", y="Hard_Y_Authenticity", text="Location",
+        range_x=[-60,60], range_y=[-60,60], height=350, render_mode='webgl',
+        labels={"Hard_X_Affect": "環境的快苦 (苦↔快)", "Hard_Y_Authenticity": "物質的真正性 (偽↔真)"}
+    )
+    fig_h.update_traces(marker=dict(size=12, color='firebrick', line=dict(width=1, color='DarkSlateGrey')), textposition='top center')
+    fig_h.add_hline(y=0, line_dash="dash", line_color="gray")
+    fig_h.add_vline(x=0, line_dash="dash", line_color="gray")
+    fig_h.update_layout(plot_bgcolor="rgba(255, 240, 240, 0.5)", margin=dict(l=20, r=20, t=40, b=20))
+
+    # 🟦 ソフト図
+    fig_s = px.scatter(
+        df, x="Soft_X_Affect", y="Soft_Y_Correctness", text="Location",
+        range_x=[-60,60], range_y=[-60,60], height=350, render_mode='webgl',
+        labels={"Soft_X_Affect": "体験的感情 (苦↔快)", "Soft_Y_Correctness": "史実的正確性 (誤↔正)"}
+    )
+    fig_s.update_traces(marker=dict(size=12, color='royalblue', line=dict(width=1, color='DarkSlateGrey')), textposition='top center')
+    fig_s.add_hline(y=0, line_dash="dash", line_color="gray")
+    fig_s.add_vline(x=0, line_dash="dash", line_color="gray")
+    fig_s.update_layout(plot_bgcolor="rgba(240, 240, 255, 0.5)", margin=dict(l=20, r=20, t=40, b=20))
+
+    # 🏹 統合ベクトル図
+    fig_v = go.Figure()
+    fig_v.update_layout(
+        xaxis=dict(title="感情 (苦/Pain ↔ 快/Fun)", range=[-60, 60], zeroline=True, zerolinewidth=1, zerolinecolor='gray'),
+        yaxis=dict(title="真実性 (偽・誤/Fake ↔ 真・正/True)", range=[-60, 60], zeroline=True, zerolinewidth=1, zerolinecolor='gray'),
+        plot_bgcolor="rgba(245,245,245,1)", height=500,
+        margin=dict(l=40, r=40, t=40, b=40),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1) # 凡例を上に見やすく配置
+    )
+
+    hx = df['Hard_X_Affect'].to_numpy()
+    hy = df['Hard_Y_Authenticity'].to_numpy()
+    sx = df['Soft_X_Affect'].to_numpy()
+    sy = df['Soft_Y_Correctness'].to_numpy()
+    locs = df['Location'].tolist()
+
+    # 矢印（件数が多いときは注釈ではなく1本のquiverトレースで描く）
+    if len(hx) > MAX_ARROW_ANNOTATIONS:
+        quiver = ff.create_quiver(hx, hy, sx - hx, sy - hy, scale=1, arrow_scale=0.15).data[0]
+        fig_v.add_trace(go.Scattergl(
+            x=quiver.x, y=quiver.y,
+            mode='lines', line=dict(color="rgba(100,100,100,0.6)", width=2),
+            name='Hard → Soft', hoverinfo='skip'
+        ))
+    else:
+        # 注釈はリストにまとめて1回で設定する（1件ずつ追加すると毎回検証が走る）
+        fig_v.update_layout(annotations=[
+            dict(
+                x=s_x, y=s_y,
+                ax=h_x, ay=h_y,
+                xref="x", yref="y", axref="x", ayref="y",
+                showarrow=True, arrowhead=2, arrowsize=1.2, arrowwidth=2, arrowcolor="rgba(100,100,100,0.6)"
+            )
+            for h_x, h_y, s_x, s_y in zip(hx.tolist(), hy.tolist(), sx.tolist(), sy.tolist())
+        ])
+    # ハード点（赤）
+    fig_v.add_trace(go.Scattergl(
+        x=hx, y=hy,
+        mode='markers', marker=dict(color='firebrick', size=10, line=dict(width=1, color='DarkSlateGrey')),
+        name='Hard (物質)',
+        hovertext=[f"{loc} (Hard)" for loc in locs]
+    ))
+    # ソフト点（青）
+    fig_v.add_trace(go.Scattergl(
+        x=sx, y=sy,
+        mode='markers+text', marker=dict(color='royalblue', size=12, line=dict(width=1, color='DarkSlateGrey')),
+        text=locs, textposition="top center",
+        name='Soft (体験)',
+        hovertext=[f"{loc} (Soft)" for loc in locs]
+    ))
+
+    return fig_h, fig_s, fig_v
+
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def build_map(df):
+    """訪問地点のマーカー付き地図を作成する"""
+    m = folium.Map(location=[26.3, 127.75], zoom_start=9)
+    # 座標が登録済みの地点だけを対象に、緯度・経度をまとめて引く
+    idx = np.array([LOC_IDX.get(loc, -1) for loc in df['Location']], dtype=np.intp)
+    valid = np.flatnonzero(idx >= 0)
+    lats = LATS[idx[valid]].tolist()
+    lons = LONS[idx[valid]].tolist()
+    locations = df['Location'].to_numpy()[valid].tolist()
+    # 地図ピンはハード（物質）の真正性で色分け
+    hard_y = df['Hard_Y_Authenticity'].to_numpy()[valid]
+    colors = np.where(hard_y >= 0, "blue", "red").tolist()
+    for location, lat, lon, icon_color in zip(locations, lats, lons, colors):
+        folium.Marker(
+            location=[lat, lon],
+            popup=f"{location}",
+            tooltip=location,
+            icon=folium.Icon(color=icon_color, icon="info-sign")
+        ).add_to(m)
+    return m
+
+
+@st.cache_data(show_spinner=False, max_entries=3 * RECORDS_PER_PAGE)
+def load_thumb(path):
+    """写真を縮小したJPEGのバイト列を返す（1枚につき1回だけエンコード）"""
+    im = Image.open(path)
+    # JPEGはデコード時点で縮小し、フル解像度の画像をメモリに展開しない
+    im.draft("RGB", (600, 600))
+    im = ImageOps.exif_transpose(im)
+    im.thumbnail((300, 300))
+    # 透過部分（PNG）が黒くならないよう、縮小後に白背景へ合成する
+    if im.mode in ("RGBA", "LA", "P"):
+        im = im.convert("RGBA")
+        im = Image.alpha_composite(Image.new("RGBA", im.size, "white"), im)
+    im = im.convert("RGB")
+    buf = io.BytesIO()
+    im.save(buf, "JPEG", quality=80)
+    return buf.getvalue()
+
+
+# セッション状態の初期化（ログは列の型を揃えたDataFrameで保持する）
+if 'logs_df' not in st.session_state:
     if GSHEET_ENABLED:
-        st.session_state.logs = load_from_gsheet()
+        st.session_state.logs_df = load_from_gsheet()
+        st.session_state._last_fetch = time.time()
     elif os.path.exists("okinawa_survey_data.csv"):
         try:
-            df_load = pd.read_csv("okinawa_survey_data.csv")
-            df_load = df_load.fillna("") 
-            st.session_state.logs = df_load.to_dict('records')
+            st.session_state.logs_df = _load_csv_cached(
+                "okinawa_survey_data.csv", os.path.getmtime("okinawa_survey_data.csv")
+            )
         except pd.errors.EmptyDataError:
-            st.session_state.logs = []
+            st.session_state.logs_df = logs_frame([])
     else:
-        st.session_state.logs = []
+        st.session_state.logs_df = logs_frame([])
 
-# Google Sheets接続時は毎回最新データを取得
-if GSHEET_ENABLED:
-    st.session_state.logs = load_from_gsheet()
+# Google Sheets接続時は一定間隔で最新データを取得（他の端末の記録を反映）
+# セッション内の間隔判定と、セッション間で共有される st.cache_data の2段構え
+# (このセッションで書き込んだ直後は _invalidate_logs により必ず読み直す)
+if GSHEET_ENABLED and time.time() - st.session_state.setdefault("_last_fetch", 0.0) > GSHEET_REFRESH_SEC:
+    st.session_state.logs_df = load_from_gsheet()
+    st.session_state._last_fetch = time.time()
 
 # --- サイドバー（入力画面） ---
-with st.sidebar:
+@st.fragment
+def sidebar_inputs():
+    """入力フォーム（スライダー操作はこの範囲だけ再実行される）"""
     st.header("Record Field Work")
-    locations = list(LAT_LON.keys())
+    locations = list(LOC_NAMES)
     option = st.selectbox("場所 (Location)", locations + ["その他 (自由入力)"])
     
     if option == "その他 (自由入力)":
@@ -162,8 +434,9 @@ with st.sidebar:
             file_extension = os.path.splitext(uploaded_file.name)[1]
             file_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_extension}"
             saved_photo_path = os.path.join(save_dir, file_name)
+            uploaded_file.seek(0)
             with open(saved_photo_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+                shutil.copyfileobj(uploaded_file, f, length=64 * 1024)
 
         new_log = {
             "Location": location,
@@ -175,75 +448,51 @@ with st.sidebar:
             "Image_Path": saved_photo_path,
             "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
-        st.session_state.logs.append(new_log)
+        st.session_state.logs_df = pd.concat(
+            [st.session_state.logs_df, logs_frame([new_log])], ignore_index=True
+        )
 
         if GSHEET_ENABLED:
             save_to_gsheet(new_log)
         
-        # CSVにも保存（バックアップ）
-        pd.DataFrame(st.session_state.logs).to_csv("okinawa_survey_data.csv", index=False, encoding="utf-8-sig")
+        # CSVにも保存（バックアップ、追記のみ）
+        append_to_csv(new_log)
         st.success("記録完了！")
         st.rerun()
 
+
+with st.sidebar:
+    sidebar_inputs()
+
 # --- メイン画面（可視化） ---
-if st.session_state.logs:
+if not st.session_state.logs_df.empty:
+    # 地図・グラフ・記録リストで同じDataFrameを使い回す
+    df = st.session_state.logs_df
+
     # 画面を左(地図)と右(グラフ群)に分割
     col_map_side, col_graphs_side = st.columns([1, 2.5])
 
     # === 左側：地図 ===
     with col_map_side:
         st.subheader("📍 Field Map")
-        m = folium.Map(location=[26.3, 127.75], zoom_start=9)
-        for log in st.session_state.logs:
-            if log['Location'] in LAT_LON:
-                # 地図ピンはハード（物質）の真正性で色分け
-                icon_color = "blue" if log.get('Hard_Y_Authenticity', 0) >= 0 else "red"
-                folium.Marker(
-                    location=LAT_LON[log['Location']],
-                    popup=f"{log['Location']}",
-                    tooltip=log['Location'],
-                    icon=folium.Icon(color=icon_color, icon="info-sign")
-                ).add_to(m)
-        st_folium(m, height=600, width=None) # 高さをグラフ群に合わせる
+        m = build_map(df)
+        st_folium(m, height=600, width=None, returned_objects=[], key="map") # 高さをグラフ群に合わせる
 
     # === 右側：グラフ群 ===
     with col_graphs_side:
-        df = pd.DataFrame(st.session_state.logs)
-        
-        # 数値型に変換（Google Sheetsから文字列で来る場合の対策）
-        for col in ["Hard_Y_Authenticity", "Hard_X_Affect", "Soft_Y_Correctness", "Soft_X_Affect"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
+        fig_h, fig_s, fig_v = build_figures(df)
+
         # --- 上段：個別分析グラフ（左右分割） ---
         col_hard_g, col_soft_g = st.columns(2)
         
         # 🟥 ハード図
         with col_hard_g:
             st.subheader("🟥 ハード (器・環境)")
-            fig_h = px.scatter(
-                df, x="Hard_X_Affect", y="Hard_Y_Authenticity", text="Location",
-                range_x=[-60,60], range_y=[-60,60], height=350,
-                labels={"Hard_X_Affect": "環境的快苦 (苦↔快)", "Hard_Y_Authenticity": "物質的真正性 (偽↔真)"}
-            )
-            fig_h.update_traces(marker=dict(size=12, color='firebrick', line=dict(width=1, color='DarkSlateGrey')), textposition='top center')
-            fig_h.add_hline(y=0, line_dash="dash", line_color="gray")
-            fig_h.add_vline(x=0, line_dash="dash", line_color="gray")
-            fig_h.update_layout(plot_bgcolor="rgba(255, 240, 240, 0.5)", margin=dict(l=20, r=20, t=40, b=20))
             st.plotly_chart(fig_h, use_container_width=True)
 
         # 🟦 ソフト図
         with col_soft_g:
             st.subheader("🟦 ソフト (中身・情報)")
-            fig_s = px.scatter(
-                df, x="Soft_X_Affect", y="Soft_Y_Correctness", text="Location",
-                range_x=[-60,60], range_y=[-60,60], height=350,
-                labels={"Soft_X_Affect": "体験的感情 (苦↔快)", "Soft_Y_Correctness": "史実的正確性 (誤↔正)"}
-            )
-            fig_s.update_traces(marker=dict(size=12, color='royalblue', line=dict(width=1, color='DarkSlateGrey')), textposition='top center')
-            fig_s.add_hline(y=0, line_dash="dash", line_color="gray")
-            fig_s.add_vline(x=0, line_dash="dash", line_color="gray")
-            fig_s.update_layout(plot_bgcolor="rgba(240, 240, 255, 0.5)", margin=dict(l=20, r=20, t=40, b=20))
             st.plotly_chart(fig_s, use_container_width=True)
             
         st.write("---") # 区切り線
@@ -252,77 +501,43 @@ if st.session_state.logs:
         st.subheader("🏹 統合ベクトル分析 (Hard → Soft)")
         st.caption("赤丸(物質)から青丸(体験)への「矢印」が、演出による変化の軌跡を表します。")
         
-        fig_v = go.Figure()
-        fig_v.update_layout(
-            xaxis=dict(title="感情 (苦/Pain ↔ 快/Fun)", range=[-60, 60], zeroline=True, zerolinewidth=1, zerolinecolor='gray'),
-            yaxis=dict(title="真実性 (偽・誤/Fake ↔ 真・正/True)", range=[-60, 60], zeroline=True, zerolinewidth=1, zerolinecolor='gray'),
-            plot_bgcolor="rgba(245,245,245,1)", height=500,
-            margin=dict(l=40, r=40, t=40, b=40),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1) # 凡例を上に見やすく配置
-        )
-
-        for i, log in enumerate(st.session_state.logs):
-            h_x = float(log.get('Hard_X_Affect', 0) or 0)
-            h_y = float(log.get('Hard_Y_Authenticity', 0) or 0)
-            s_x = float(log.get('Soft_X_Affect', 0) or 0)
-            s_y = float(log.get('Soft_Y_Correctness', 0) or 0)
-            
-            # 矢印
-            fig_v.add_annotation(
-                x=s_x, y=s_y,
-                ax=h_x, ay=h_y,
-                xref="x", yref="y", axref="x", ayref="y",
-                showarrow=True, arrowhead=2, arrowsize=1.2, arrowwidth=2, arrowcolor="rgba(100,100,100,0.6)"
-            )
-            # ハード点（赤）
-            fig_v.add_trace(go.Scatter(
-                x=[h_x], y=[h_y],
-                mode='markers', marker=dict(color='firebrick', size=10, line=dict(width=1, color='DarkSlateGrey')),
-                name='Hard (物質)' if i == 0 else None, showlegend=(i == 0),
-                hovertext=f"{log['Location']} (Hard)"
-            ))
-            # ソフト点（青）
-            fig_v.add_trace(go.Scatter(
-                x=[s_x], y=[s_y],
-                mode='markers+text', marker=dict(color='royalblue', size=12, line=dict(width=1, color='DarkSlateGrey')),
-                text=[log['Location']], textposition="top center",
-                name='Soft (体験)' if i == 0 else None, showlegend=(i == 0),
-                hovertext=f"{log['Location']} (Soft)"
-            ))
-
         st.plotly_chart(fig_v, use_container_width=True)
 
     # === 最下部：記録リスト ===
     st.write("---")
     st.subheader("📜 Records List")
-    for i in range(len(st.session_state.logs) - 1, -1, -1):
-        log = st.session_state.logs[i]
-        with st.expander(f"【{log['Location']}】 ({log['Timestamp']})"):
+    # 新しい順に RECORDS_PER_PAGE 件ずつ表示する
+    n_pages = (len(df) - 1) // RECORDS_PER_PAGE + 1
+    page = st.number_input("ページ (Page)", min_value=1, max_value=n_pages, value=1) if n_pages > 1 else 1
+    newest_first = df.iloc[::-1]
+    for log in newest_first.iloc[(page - 1) * RECORDS_PER_PAGE:page * RECORDS_PER_PAGE].itertuples():
+        i = log.Index
+        with st.expander(f"【{log.Location}】 ({log.Timestamp})"):
             c1, c2 = st.columns([1, 3])
             with c1:
-                img_path = log.get("Image_Path", "")
+                img_path = log.Image_Path
                 if img_path and isinstance(img_path, str) and os.path.exists(img_path):
-                    st.image(img_path, use_container_width=True)
+                    st.image(load_thumb(img_path), use_container_width=True)
                 if st.button(f"🗑️ 削除", key=f"del_{i}"):
-                    if img_path and isinstance(img_path, str) and os.path.exists(img_path):
-                        os.remove(img_path)
+                    if img_path and isinstance(img_path, str):
+                        _io_executor().submit(remove_photo, img_path)
                     
                     if GSHEET_ENABLED:
-                        delete_from_gsheet(i)
+                        delete_from_gsheet({c: getattr(log, c) for c in ROW_KEY_COLS})
                     
-                    st.session_state.logs.pop(i)
-                    pd.DataFrame(st.session_state.logs).to_csv("okinawa_survey_data.csv", index=False, encoding="utf-8-sig")
+                    st.session_state.logs_df = st.session_state.logs_df.drop(index=i).reset_index(drop=True)
+                    st.session_state.logs_df.to_csv("okinawa_survey_data.csv", index=False, encoding="utf-8-sig", float_format="%g")
                     st.rerun()
             with c2:
                 col_h_s, col_s_s = st.columns(2)
                 with col_h_s:
                     st.markdown("##### 🟥 Hard Status")
-                    st.write(f"真正性(Y): `{log.get('Hard_Y_Authenticity', 0)}`")
-                    st.write(f"感情(X): `{log.get('Hard_X_Affect', 0)}`")
+                    st.write(f"真正性(Y): `{log.Hard_Y_Authenticity:g}`")
+                    st.write(f"感情(X): `{log.Hard_X_Affect:g}`")
                 with col_s_s:
                     st.markdown("##### 🟦 Soft Status")
-                    st.write(f"正確性(Y): `{log.get('Soft_Y_Correctness', 0)}`")
-                    st.write(f"感情(X): `{log.get('Soft_X_Affect', 0)}`")
-                st.info(f"**📝 コメント:**\n{log['Comment']}")
+                    st.write(f"正確性(Y): `{log.Soft_Y_Correctness:g}`")
+                    st.write(f"感情(X): `{log.Soft_X_Affect:g}`")
+                st.info(f"**📝 コメント:**\n{log.Comment}")
 else:
     st.info("← 左側のサイドバーから、最初の調査記録を追加してください。")
\ No newline at end of file